@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import os
+import random
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Kept free of server state: spawn-pool workers import this module, not app.main.
+
+# zlib level for generated capture PNGs; simulator output favors encode speed over size.
+PNG_COMPRESS_LEVEL = int(os.getenv("SATTI_PNG_COMPRESS_LEVEL", "1"))
+
+
+def random_hex_color() -> tuple[int, int, int]:
+    return random.randint(0, 255), random.randint(0, 255), random.randint(0, 255)
+
+
+def generate_optical_image(width: int, height: int, cloud_percent: int, output_path: Path) -> None:
+    rng = np.random.default_rng()
+
+    c1 = random_hex_color()
+    c2 = random_hex_color()
+    c3 = random_hex_color()
+
+    # Row (t) / column (s) ramps broadcast to the full frame; same gradient as the per-pixel formula.
+    t = np.linspace(0.0, 1.0, height, dtype=np.float32)[:, None]
+    s = np.linspace(0.0, 1.0, width, dtype=np.float32)[None, :]
+    r = (1 - t) * c1[0] + t * c2[0] * (0.6 + 0.4 * s)
+    g = (1 - s) * c2[1] + s * c3[1] * (0.6 + 0.4 * t)
+    b = (1 - t) * c3[2] + t * c1[2] * (0.6 + 0.4 * s)
+    # Truncate like int(), then wrap mod 256.
+    arr = (np.stack([r, g, b], axis=-1).astype(np.uint16) & 0xFF).astype(np.uint8)
+
+    cloud_samples = int((width * height) * (cloud_percent / 100.0) * 0.03)
+    if cloud_samples:
+        ys = rng.integers(0, height, cloud_samples)
+        xs = rng.integers(0, width, cloud_samples)
+        arr[ys, xs] = rng.integers(190, 256, (cloud_samples, 1), dtype=np.uint8)
+
+    Image.fromarray(arr).save(output_path, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
+
+
+def generate_sar_image(width: int, height: int, output_path: Path) -> None:
+    rng = np.random.default_rng()
+
+    base = (70 + 185 * np.arange(height, dtype=np.float32) / max(1, height - 1)).astype(np.int16)[:, None]
+    speckle = rng.integers(-45, 46, (height, width), dtype=np.int16)
+    arr = np.clip(base + speckle, 0, 255).astype(np.uint8)
+
+    Image.fromarray(arr).save(output_path, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
@@ -5,24 +5,34 @@ import random
 import threading
 import time
 import uuid
+import hmac
 import math
-from collections import defaultdict, deque
+import multiprocessing
+import zlib
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from enum import Enum
 from io import BytesIO
 from pathlib import Path
 from typing import Any, Literal
-from urllib import error as url_error
-from urllib import request as url_request
 
+import httpx
+import numpy as np
+import orjson
 from fastapi import FastAPI, HTTPException, Query, Request
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from starlette.responses import JSONResponse
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, TypeAdapter, model_validator
 from PIL import Image
 
+from app.imaging import PNG_COMPRESS_LEVEL, generate_optical_image, generate_sar_image
+
 
 BASE_DIR = Path(__file__).resolve().parent
 STATIC_DIR = BASE_DIR / "static"
@@ -31,6 +41,9 @@ PROJECT_DIR = BASE_DIR.parent
 DATA_DIR = PROJECT_DIR / "data"
 IMAGE_DIR = DATA_DIR / "images"
 IMAGE_DIR.mkdir(parents=True, exist_ok=True)
+CLEARABLE_IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".webp")
+TILE_CACHE_DIR = DATA_DIR / "tile_cache"
+TILE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 
 class SatelliteType(str, Enum):
@@ -120,6 +133,58 @@ class ExternalMapSource(str, Enum):
     OSM = "OSM"
 
 
+class PreviewImageFormat(str, Enum):
+    PNG = "PNG"
+    WEBP = "WEBP"
+
+
+# Member -> wire string; a dict hit is several times cheaper than the Enum.value property.
+UPLINK_ENUM_VALUES: dict[Enum, str] = {
+    member: member.value
+    for enum_cls in (
+        GroundStationType,
+        GroundStationStatus,
+        TaskPriority,
+        LookSide,
+        PassDirection,
+        DeliveryMethod,
+        GenerationMode,
+        ExternalMapSource,
+    )
+    for member in enum_cls
+}
+
+
+def parse_iso_utc(value: str) -> datetime:
+    # Fast path for the canonical client shape: YYYY-MM-DDTHH:MM:SS[.fff]Z
+    if (
+        len(value) in (20, 24)
+        and value[-1] == "Z"
+        and value[4] == "-"
+        and value[7] == "-"
+        and value[10] == "T"
+        and value[13] == ":"
+        and value[16] == ":"
+        and (len(value) == 20 or value[19] == ".")
+    ):
+        digits = value[0:4] + value[5:7] + value[8:10] + value[11:13] + value[14:16] + value[17:19] + value[20:23]
+        # int() also takes spaces, signs, underscores and non-ASCII digits; leave those to fromisoformat.
+        if digits.isascii() and digits.isdigit():
+            return datetime(
+                int(value[0:4]),
+                int(value[5:7]),
+                int(value[8:10]),
+                int(value[11:13]),
+                int(value[14:16]),
+                int(value[17:19]),
+                int(value[20:23]) * 1000 if len(value) == 24 else 0,
+                tzinfo=UTC,
+            )
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
 class UplinkCommandRequest(BaseModel):
     satellite_id: str
     ground_station_id: str | None = Field(default=None, min_length=1, max_length=40)
@@ -173,8 +238,8 @@ class UplinkCommandRequest(BaseModel):
 
         if self.window_open_utc and self.window_close_utc:
             try:
-                open_dt = datetime.fromisoformat(self.window_open_utc.replace("Z", "+00:00"))
-                close_dt = datetime.fromisoformat(self.window_close_utc.replace("Z", "+00:00"))
+                open_dt = parse_iso_utc(self.window_open_utc)
+                close_dt = parse_iso_utc(self.window_close_utc)
             except ValueError as exc:
                 raise ValueError("window_open_utc/window_close_utc must be ISO8601") from exc
             if open_dt >= close_dt:
@@ -267,6 +332,10 @@ class CommandStatusResponse(BaseModel):
     product_metadata: dict[str, Any] | None
 
 
+# Serializes a whole command list in one pydantic-core call.
+COMMAND_STATUS_LIST_ADAPTER = TypeAdapter(list[CommandStatusResponse])
+
+
 class SaveLocalDownloadResponse(BaseModel):
     command_id: str
     saved_path: str
@@ -280,7 +349,7 @@ class ClearImagesResponse(BaseModel):
     message: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Satellite:
     satellite_id: str
     name: str
@@ -288,7 +357,7 @@ class Satellite:
     status: SatelliteStatus
 
 
-@dataclass
+@dataclass(slots=True)
 class GroundStation:
     ground_station_id: str
     name: str
@@ -297,19 +366,19 @@ class GroundStation:
     location: str | None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SatelliteTypeProfile:
     platform: str
     orbit_type: str
     nominal_altitude_km: int
     nominal_swath_km: int
     revisit_hours: int
-    sensor_modes: list[str]
+    sensor_modes: tuple[str, ...]
     default_product_type: str
-    default_bands_or_polarization: list[str]
+    default_bands_or_polarization: tuple[str, ...]
 
 
-@dataclass
+@dataclass(slots=True)
 class Command:
     command_id: str
     satellite_id: str
@@ -334,18 +403,89 @@ class Command:
         self.updated_at = datetime.now(UTC)
 
 
-app = FastAPI(title="Virtual Satellite Simulator", version="0.3.0")
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    global image_process_pool, pipeline_executor
+    yield
+    # Detach the pools so a later lifespan in this process lazily starts fresh ones.
+    with executor_lock:
+        pool, image_process_pool = image_process_pool, None
+        executor, pipeline_executor = pipeline_executor, None
+    # Drop queued pipeline runs on shutdown; the in-memory store they would update dies with the process.
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+    # Join the workers so multiprocessing does not report leaked semaphores at exit.
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+app = FastAPI(
+    title="Virtual Satellite Simulator",
+    version="0.3.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
+# Read-copy-update stores: writers build a new dict under the collection lock and rebind the name,
+# so readers can take a consistent snapshot by just reading the module global.
+# Items themselves are still updated in place under the collection lock.
 satellites: dict[str, Satellite] = {}
 ground_stations: dict[str, GroundStation] = {}
+# Commands are append-only and never pruned, so copying on every uplink would grow with history.
+# Inserts happen in place under commands_lock; readers use single get() calls or iterate a
+# list(commands.values()) snapshot, which the GIL builds atomically.
 commands: dict[str, Command] = {}
-store_lock = threading.Lock()
-rate_lock = threading.Lock()
-rate_buckets: dict[str, deque[float]] = defaultdict(deque)
+# Secondary name -> ids indexes (names are not unique), kept in sync under the collection lock.
+satellite_ids_by_name: dict[str, set[str]] = {}
+ground_station_ids_by_name: dict[str, set[str]] = {}
+# Encoded JSON per list item, kept in the same order as its store and republished by every writer,
+# so list endpoints only join bytes.
+satellite_json_cache: dict[str, bytes] = {}
+ground_station_json_cache: dict[str, bytes] = {}
+# Bumped under the collection lock after every change; list ETags are derived from them.
+satellite_json_version = 0
+ground_station_json_version = 0
+commands_version = 0
+# Counters restart at zero, so ETags also carry a per-process token to stay unique across restarts.
+ETAG_EPOCH = uuid.uuid4().hex[:8]
+# One lock per collection. When more than one is needed, take them in this order:
+# ground_stations_lock -> satellites_lock -> commands_lock.
+ground_stations_lock = threading.Lock()
+satellites_lock = threading.Lock()
+commands_lock = threading.Lock()
+# Per-IP request counters for the current minute, sharded by client IP to spread lock contention.
+RATE_SHARD_COUNT = 16
+rate_locks = [threading.Lock() for _ in range(RATE_SHARD_COUNT)]
+rate_buckets: list[dict[str, int]] = [{} for _ in range(RATE_SHARD_COUNT)]
+rate_windows: list[int] = [0] * RATE_SHARD_COUNT
+tile_cache_lock = threading.Lock()
+# Shared pool so the 3x3 mosaic tiles are fetched concurrently.
+tile_fetch_executor = ThreadPoolExecutor(max_workers=9, thread_name_prefix="tile-fetch")
+# Pooled keep-alive client so mosaic tiles share TLS connections to the tile server.
+tile_http_client = httpx.Client(
+    http2=True,
+    headers={"User-Agent": "satti-sim/0.2 (+https://localhost; contact: local-dev)"},
+    timeout=8,
+    limits=httpx.Limits(max_keepalive_connections=16),
+)
+
+# Created on first use and detached again on lifespan shutdown, so importing this module starts
+# no workers. executor_lock guards creating and swapping both.
+image_process_pool: ProcessPoolExecutor | None = None
+pipeline_executor: ThreadPoolExecutor | None = None
+executor_lock = threading.Lock()
+tile_cache_bytes: int | None = None
+# Set while one thread rescans/evicts the tile cache outside tile_cache_lock.
+tile_cache_evicting = False
 
 API_KEY_HEADER = "x-api-key"
 API_KEY = os.getenv("SATTI_API_KEY", "change-me")
+API_KEY_BYTES = API_KEY.encode("utf-8")
 RATE_LIMIT_PER_MIN = int(os.getenv("SATTI_RATE_LIMIT_PER_MIN", "600"))
+# Set SATTI_TILE_CACHE_MAX_MB<=0 to disable the on-disk map tile cache.
+TILE_CACHE_MAX_BYTES = int(os.getenv("SATTI_TILE_CACHE_MAX_MB", "500")) * 1024 * 1024
+# Concurrent capture pipelines; runs are mostly simulated waits, so this is well above the CPU count.
+PIPELINE_WORKERS = int(os.getenv("SATTI_PIPELINE_WORKERS", "32"))
 ALLOWED_ORIGINS = [
     origin.strip()
     for origin in os.getenv("SATTI_ALLOWED_ORIGINS", "http://localhost:6005,http://127.0.0.1:6005").split(",")
@@ -359,6 +499,8 @@ PUBLIC_PATHS = {
     "/redoc",
     "/openapi.json",
 }
+PUBLIC_PATH_PREFIXES = ("/static",)
+QUERY_KEY_PATH_PREFIX = "/downloads/"
 
 
 app.add_middleware(
@@ -376,9 +518,9 @@ SATELLITE_TYPE_PROFILES: dict[SatelliteType, SatelliteTypeProfile] = {
         nominal_altitude_km=500,
         nominal_swath_km=24,
         revisit_hours=24,
-        sensor_modes=["NADIR", "OFF_NADIR"],
+        sensor_modes=("NADIR", "OFF_NADIR"),
         default_product_type="L1B_ORTHOREADY",
-        default_bands_or_polarization=["R", "G", "B", "NIR"],
+        default_bands_or_polarization=("R", "G", "B", "NIR"),
     ),
     SatelliteType.SAR: SatelliteTypeProfile(
         platform="Low Earth Orbit radar",
@@ -386,12 +528,37 @@ SATELLITE_TYPE_PROFILES: dict[SatelliteType, SatelliteTypeProfile] = {
         nominal_altitude_km=550,
         nominal_swath_km=30,
         revisit_hours=12,
-        sensor_modes=["SPOTLIGHT", "STRIPMAP"],
+        sensor_modes=("SPOTLIGHT", "STRIPMAP"),
         default_product_type="GRD",
-        default_bands_or_polarization=["VV", "VH"],
+        default_bands_or_polarization=("VV", "VH"),
     ),
 }
 
+# Choice pools for mock metadata; every command shares these string objects.
+GROUND_TRACKS = ("ASCENDING", "DESCENDING")
+SAR_LOOK_SIDES = ("LEFT", "RIGHT")
+SAR_SPECKLE_FILTERS = ("NONE", "LEE_3x3")
+
+# Response-shaped profile payloads, built once and shared by every satellite_to_dict() call.
+SATELLITE_TYPE_PROFILE_DICTS: dict[SatelliteType, dict[str, Any]] = {
+    sat_type: {
+        "platform": profile.platform,
+        "orbit_type": profile.orbit_type,
+        "nominal_altitude_km": profile.nominal_altitude_km,
+        "nominal_swath_km": profile.nominal_swath_km,
+        "revisit_hours": profile.revisit_hours,
+        "sensor_modes": profile.sensor_modes,
+        "default_product_type": profile.default_product_type,
+        "default_bands_or_polarization": profile.default_bands_or_polarization,
+    }
+    for sat_type, profile in SATELLITE_TYPE_PROFILES.items()
+}
+# GET /satellite-types body; profiles never change at runtime, so encode once.
+SATELLITE_TYPES_JSON = orjson.dumps(
+    {sat_type.value: profile_dict for sat_type, profile_dict in SATELLITE_TYPE_PROFILE_DICTS.items()}
+)
+SATELLITE_TYPES_ETAG = f'"{zlib.crc32(SATELLITE_TYPES_JSON):08x}"'
+
 
 @app.middleware("http")
 async def auth_and_rate_limit(request: Request, call_next):
@@ -400,32 +567,50 @@ async def auth_and_rate_limit(request: Request, call_next):
         return await call_next(request)
 
     # Protect all operational APIs by default, except explicit public paths.
-    if path not in PUBLIC_PATHS and not path.startswith("/static"):
+    if path not in PUBLIC_PATHS and not path.startswith(PUBLIC_PATH_PREFIXES):
         # Browser download links cannot attach custom headers easily.
         # Allow api_key query only for download endpoint.
         api_key = request.headers.get(API_KEY_HEADER, "")
-        if path.startswith("/downloads/") and not api_key:
+        if not api_key and path.startswith(QUERY_KEY_PATH_PREFIX):
             api_key = request.query_params.get("api_key", "")
-        if api_key != API_KEY:
+        if not hmac.compare_digest(api_key.encode("utf-8"), API_KEY_BYTES):
             return JSONResponse(status_code=401, content={"detail": "Unauthorized"})
 
-    # Simple fixed-window-ish limiter per client IP.
+    # Fixed one-minute window limiter per client IP.
     # Set SATTI_RATE_LIMIT_PER_MIN<=0 to disable the limiter.
     if RATE_LIMIT_PER_MIN > 0:
         client_ip = request.client.host if request.client else "unknown"
-        now_ts = time.time()
-        with rate_lock:
-            bucket = rate_buckets[client_ip]
-            while bucket and now_ts - bucket[0] > 60:
-                bucket.popleft()
-            if len(bucket) >= RATE_LIMIT_PER_MIN:
+        window = int(time.monotonic() // 60)
+        shard = hash(client_ip) & (RATE_SHARD_COUNT - 1)
+        bucket = rate_buckets[shard]
+        with rate_locks[shard]:
+            if rate_windows[shard] != window:
+                # Counts from an earlier window no longer matter; drop them all at once.
+                bucket.clear()
+                rate_windows[shard] = window
+            count = bucket.get(client_ip, 0)
+            if count >= RATE_LIMIT_PER_MIN:
                 return JSONResponse(status_code=429, content={"detail": "Too Many Requests"})
-            bucket.append(now_ts)
+            bucket[client_ip] = count + 1
 
     return await call_next(request)
 
 
+def index_name_locked(index: dict[str, set[str]], name: str, item_id: str) -> None:
+    index.setdefault(name, set()).add(item_id)
+
+
+def unindex_name_locked(index: dict[str, set[str]], name: str, item_id: str) -> None:
+    ids = index.get(name)
+    if ids is None:
+        return
+    ids.discard(item_id)
+    if not ids:
+        del index[name]
+
+
 def seed_default_satellites_locked() -> list[str]:
+    global satellites, satellite_json_cache, satellite_json_version
     seeded_ids: list[str] = []
     presets = [
         ("KOMPSAT-3 (Arirang-3)", SatelliteType.EO_OPTICAL),
@@ -436,101 +621,74 @@ def seed_default_satellites_locked() -> list[str]:
         ("KOMPSAT-6 (Arirang-6, SAR)", SatelliteType.SAR),
         ("KOMPSAT-Next-5 (C-band SAR)", SatelliteType.SAR),
     ]
+    updated = dict(satellites)
+    updated_json = dict(satellite_json_cache)
     for name, sat_type in presets:
-        exists = any(sat.name == name for sat in satellites.values())
-        if exists:
+        if name in satellite_ids_by_name:
             continue
         sat_id = f"sat-{uuid.uuid4().hex[:8]}"
-        satellites[sat_id] = Satellite(
+        sat = Satellite(
             satellite_id=sat_id,
             name=name,
             type=sat_type,
             status=SatelliteStatus.AVAILABLE,
         )
+        updated[sat_id] = sat
+        updated_json[sat_id] = orjson.dumps(satellite_to_dict(sat))
+        index_name_locked(satellite_ids_by_name, name, sat_id)
         seeded_ids.append(sat_id)
+    satellites = updated
+    satellite_json_cache = updated_json
+    satellite_json_version += 1
     return seeded_ids
 
 
 def seed_default_ground_stations_locked() -> list[str]:
+    global ground_stations, ground_station_json_cache, ground_station_json_version
     seeded_ids: list[str] = []
     presets = [
         ("Daejeon Mission Control Ground Station", GroundStationType.FIXED, "Daejeon"),
         ("Jeju Maritime Satellite Ground Station", GroundStationType.MARITIME, "Jeju"),
         ("Incheon Airborne Relay Ground Station", GroundStationType.AIRBORNE, "Incheon"),
     ]
+    updated = dict(ground_stations)
+    updated_json = dict(ground_station_json_cache)
     for name, station_type, location in presets:
-        exists = any(station.name == name for station in ground_stations.values())
-        if exists:
+        if name in ground_station_ids_by_name:
             continue
         station_id = f"gnd-{uuid.uuid4().hex[:8]}"
-        ground_stations[station_id] = GroundStation(
+        station = GroundStation(
             ground_station_id=station_id,
             name=name,
             type=station_type,
             status=GroundStationStatus.OPERATIONAL,
             location=location,
         )
+        updated[station_id] = station
+        updated_json[station_id] = orjson.dumps(ground_station_to_dict(station))
+        index_name_locked(ground_station_ids_by_name, name, station_id)
         seeded_ids.append(station_id)
+    ground_stations = updated
+    ground_station_json_cache = updated_json
+    ground_station_json_version += 1
     return seeded_ids
 
 
 def now_iso(dt: datetime) -> str:
-    return dt.isoformat().replace("+00:00", "Z")
-
-
-def random_hex_color() -> tuple[int, int, int]:
-    return random.randint(0, 255), random.randint(0, 255), random.randint(0, 255)
-
-
-def generate_optical_image(command: Command, output_path: Path) -> None:
-    width, height = command.width, command.height
-    img = Image.new("RGB", (width, height))
-    px = img.load()
-
-    c1 = random_hex_color()
-    c2 = random_hex_color()
-    c3 = random_hex_color()
-
-    for y in range(height):
-        t = y / max(1, height - 1)
-        for x in range(width):
-            s = x / max(1, width - 1)
-            r = int((1 - t) * c1[0] + t * c2[0] * (0.6 + 0.4 * s)) % 256
-            g = int((1 - s) * c2[1] + s * c3[1] * (0.6 + 0.4 * t)) % 256
-            b = int((1 - t) * c3[2] + t * c1[2] * (0.6 + 0.4 * s)) % 256
-            px[x, y] = (r, g, b)
-
-    cloud_samples = int((width * height) * (command.cloud_percent / 100.0) * 0.03)
-    for _ in range(cloud_samples):
-        x = random.randint(0, width - 1)
-        y = random.randint(0, height - 1)
-        cloud = random.randint(190, 255)
-        px[x, y] = (cloud, cloud, cloud)
-
-    img.save(output_path, format="PNG")
-
-
-def generate_sar_image(command: Command, output_path: Path) -> None:
-    width, height = command.width, command.height
-    img = Image.new("L", (width, height))
-    px = img.load()
-
-    for y in range(height):
-        base = int(70 + (185 * y / max(1, height - 1)))
-        for x in range(width):
-            speckle = random.randint(-45, 45)
-            v = max(0, min(255, base + speckle))
-            px[x, y] = v
-
-    img.save(output_path, format="PNG")
+    # All timestamps are UTC; format directly instead of isoformat() + replace().
+    return (
+        f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}T"
+        f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}.{dt.microsecond:06d}Z"
+    )
 
 
 def latlon_to_tile(lat: float, lon: float, zoom: int) -> tuple[float, float]:
     lat = max(-85.05112878, min(85.05112878, lat))
-    n = 2**zoom
+    n = float(1 << zoom)
     x = (lon + 180.0) / 360.0 * n
     lat_rad = math.radians(lat)
-    y = (1.0 - math.log(math.tan(lat_rad) + 1 / math.cos(lat_rad)) / math.pi) / 2.0 * n
+    # ln(tan(lat) + sec(lat)) == ln(tan(pi/4 + lat/2)): one tan + one log.
+    y = (1.0 - math.log(math.tan(math.pi * 0.25 + lat_rad * 0.5)) / math.pi) * 0.5 * n
     return x, y
 
 
@@ -547,20 +705,90 @@ def derive_center_from_request_profile(request_profile: dict[str, Any]) -> tuple
     raise ValueError("External generation requires AOI center or bbox")
 
 
+def evict_tile_cache() -> int:
+    entries: list[tuple[float, int, Path]] = []
+    for tile_file in TILE_CACHE_DIR.rglob("*.png"):
+        try:
+            st = tile_file.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((st.st_mtime, st.st_size, tile_file))
+
+    total = sum(size for _, size, _ in entries)
+    if total <= TILE_CACHE_MAX_BYTES:
+        return total
+
+    # Drop least recently used tiles until comfortably below the limit.
+    target = TILE_CACHE_MAX_BYTES * 0.9
+    entries.sort(key=lambda entry: entry[0])
+    for _, size, tile_file in entries:
+        if total <= target:
+            break
+        try:
+            tile_file.unlink()
+        except FileNotFoundError:
+            pass
+        total -= size
+    return total
+
+
+def store_cached_tile(cache_path: Path, raw: bytes) -> None:
+    global tile_cache_bytes, tile_cache_evicting
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    tmp_path.write_bytes(raw)
+    os.replace(tmp_path, cache_path)
+
+    with tile_cache_lock:
+        if tile_cache_bytes is not None:
+            tile_cache_bytes += len(raw)
+            if tile_cache_bytes <= TILE_CACHE_MAX_BYTES:
+                return
+        if tile_cache_evicting:
+            return
+        tile_cache_evicting = True
+
+    # The directory walk and unlinks run unlocked so other tile fetches never wait on disk I/O.
+    # The first store after startup takes this path too, to measure the existing cache.
+    total = None
+    try:
+        total = evict_tile_cache()
+    finally:
+        with tile_cache_lock:
+            tile_cache_evicting = False
+            if total is not None:
+                tile_cache_bytes = total
+
+
 def fetch_tile_osm(zoom: int, x: int, y: int) -> Image.Image:
     n = 2**zoom
     wrapped_x = x % n
     clamped_y = max(0, min(n - 1, y))
+    cache_path = TILE_CACHE_DIR / str(zoom) / str(wrapped_x) / f"{clamped_y}.png"
+    if TILE_CACHE_MAX_BYTES > 0:
+        try:
+            raw = cache_path.read_bytes()
+        except FileNotFoundError:
+            pass
+        else:
+            try:
+                # Refresh mtime so eviction treats the tile as recently used.
+                os.utime(cache_path)
+            except OSError:
+                pass
+            return Image.open(BytesIO(raw)).convert("RGB")
+
     url = f"https://tile.openstreetmap.org/{zoom}/{wrapped_x}/{clamped_y}.png"
-    req = url_request.Request(
-        url,
-        headers={
-            "User-Agent": "satti-sim/0.2 (+https://localhost; contact: local-dev)",
-        },
-    )
-    with url_request.urlopen(req, timeout=8) as resp:
-        raw = resp.read()
-    return Image.open(BytesIO(raw)).convert("RGB")
+    resp = tile_http_client.get(url)
+    resp.raise_for_status()
+    raw = resp.content
+    tile = Image.open(BytesIO(raw)).convert("RGB")
+    if TILE_CACHE_MAX_BYTES > 0:
+        try:
+            store_cached_tile(cache_path, raw)
+        except OSError:
+            pass
+    return tile
 
 
 def build_external_map_image(
@@ -580,24 +808,30 @@ def build_external_map_image(
     tile_y = int(tile_y_f)
 
     # Build a 3x3 tile mosaic around center, then crop at center and resize to target.
-    mosaic = Image.new("RGB", (256 * 3, 256 * 3))
-    for dy in range(-1, 2):
-        for dx in range(-1, 2):
-            try:
-                tile_img = fetch_tile_osm(zoom, tile_x + dx, tile_y + dy)
-            except (url_error.URLError, TimeoutError) as exc:
-                raise ValueError(f"External map tile fetch failed: {exc}") from exc
-            mosaic.paste(tile_img, ((dx + 1) * 256, (dy + 1) * 256))
+    offsets = [(dx, dy) for dy in range(-1, 2) for dx in range(-1, 2)]
+    futures = [tile_fetch_executor.submit(fetch_tile_osm, zoom, tile_x + dx, tile_y + dy) for dx, dy in offsets]
+    mosaic = np.empty((256 * 3, 256 * 3, 3), dtype=np.uint8)
+    for (dx, dy), future in zip(offsets, futures):
+        try:
+            tile_img = future.result()
+        except httpx.HTTPError as exc:
+            raise ValueError(f"External map tile fetch failed: {exc}") from exc
+        if tile_img.size != (256, 256):
+            tile_img = tile_img.resize((256, 256), Image.Resampling.BILINEAR)
+        x0 = (dx + 1) * 256
+        y0 = (dy + 1) * 256
+        mosaic[y0 : y0 + 256, x0 : x0 + 256] = np.asarray(tile_img)
 
     px = int((tile_x_f - tile_x) * 256) + 256
     py = int((tile_y_f - tile_y) * 256) + 256
     half = 256
     left = max(0, px - half)
     top = max(0, py - half)
-    right = min(mosaic.width, px + half)
-    bottom = min(mosaic.height, py + half)
-    cropped = mosaic.crop((left, top, right, bottom))
-    final = cropped.resize((width, height), Image.Resampling.BILINEAR)
+    right = min(mosaic.shape[1], px + half)
+    bottom = min(mosaic.shape[0], py + half)
+    # Slicing is free, but fromarray copies the strided crop (tobytes, then decode) and
+    # the resize allocates again; np.asarray above also copies each tile into the mosaic.
+    final = Image.fromarray(mosaic[top:bottom, left:right]).resize((width, height), Image.Resampling.BILINEAR)
     return final
 
 
@@ -615,12 +849,14 @@ def generate_external_map_image(command: Command, output_path: Path) -> None:
         height=command.height,
         map_source=map_source,
     )
-    final.save(output_path, format="PNG")
+    final.save(output_path, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
 
 
 def build_mock_metadata(sat: Satellite, command: Command) -> tuple[dict[str, Any], dict[str, Any]]:
     profile = SATELLITE_TYPE_PROFILES[sat.type]
     capture_at = datetime.now(UTC)
+    generation = command.request_profile.get("generation", {})
+    generation_mode = generation.get("mode", "INTERNAL")
 
     if sat.type == SatelliteType.EO_OPTICAL:
         acquisition = {
@@ -629,11 +865,11 @@ def build_mock_metadata(sat: Satellite, command: Command) -> tuple[dict[str, Any
             "off_nadir_deg": round(random.uniform(2.0, 28.0), 2),
             "sun_elevation_deg": round(random.uniform(20.0, 65.0), 2),
             "cloud_cover_percent": command.cloud_percent,
-            "ground_track": random.choice(["ASCENDING", "DESCENDING"]),
+            "ground_track": random.choice(GROUND_TRACKS),
             "aoi_name": command.aoi_name,
             "aoi_center": command.request_profile.get("aoi_center"),
             "aoi_bbox": command.request_profile.get("aoi_bbox"),
-            "generation_mode": command.request_profile.get("generation", {}).get("mode", "INTERNAL"),
+            "generation_mode": generation_mode,
         }
         product = {
             "product_type": profile.default_product_type,
@@ -643,7 +879,7 @@ def build_mock_metadata(sat: Satellite, command: Command) -> tuple[dict[str, Any
             "height_px": command.height,
             "bit_depth": 8,
             "format": "PNG",
-            "image_source": command.request_profile.get("generation", {}),
+            "image_source": generation,
         }
         return acquisition, product
 
@@ -651,13 +887,13 @@ def build_mock_metadata(sat: Satellite, command: Command) -> tuple[dict[str, Any
         "captured_at": now_iso(capture_at),
         "sensor_mode": random.choice(profile.sensor_modes),
         "incidence_angle_deg": round(random.uniform(20.0, 45.0), 2),
-        "look_side": random.choice(["LEFT", "RIGHT"]),
-        "pass_direction": random.choice(["ASCENDING", "DESCENDING"]),
+        "look_side": random.choice(SAR_LOOK_SIDES),
+        "pass_direction": random.choice(GROUND_TRACKS),
         "polarization": random.choice(profile.default_bands_or_polarization),
         "aoi_name": command.aoi_name,
         "aoi_center": command.request_profile.get("aoi_center"),
         "aoi_bbox": command.request_profile.get("aoi_bbox"),
-        "generation_mode": command.request_profile.get("generation", {}).get("mode", "INTERNAL"),
+        "generation_mode": generation_mode,
     }
     product = {
         "product_type": profile.default_product_type,
@@ -665,29 +901,19 @@ def build_mock_metadata(sat: Satellite, command: Command) -> tuple[dict[str, Any
         "width_px": command.width,
         "height_px": command.height,
         "format": "PNG",
-        "speckle_filter": random.choice(["NONE", "LEE_3x3"]),
-        "image_source": command.request_profile.get("generation", {}),
+        "speckle_filter": random.choice(SAR_SPECKLE_FILTERS),
+        "image_source": generation,
     }
     return acquisition, product
 
 
 def satellite_to_dict(sat: Satellite) -> dict[str, Any]:
-    profile = SATELLITE_TYPE_PROFILES[sat.type]
     return {
         "satellite_id": sat.satellite_id,
         "name": sat.name,
         "type": sat.type,
         "status": sat.status,
-        "profile": {
-            "platform": profile.platform,
-            "orbit_type": profile.orbit_type,
-            "nominal_altitude_km": profile.nominal_altitude_km,
-            "nominal_swath_km": profile.nominal_swath_km,
-            "revisit_hours": profile.revisit_hours,
-            "sensor_modes": profile.sensor_modes,
-            "default_product_type": profile.default_product_type,
-            "default_bands_or_polarization": profile.default_bands_or_polarization,
-        },
+        "profile": SATELLITE_TYPE_PROFILE_DICTS[sat.type],
     }
 
 
@@ -701,41 +927,103 @@ def ground_station_to_dict(station: GroundStation) -> dict[str, Any]:
     }
 
 
+def encode_json_list(cache: dict[str, bytes]) -> bytes:
+    return b"[" + b",".join(cache.values()) + b"]"
+
+
+def etag_json_response(request: Request, etag: str, build_body: Callable[[], bytes]) -> Response:
+    # Callers read their version counter before building, so a racing write only costs a refetch.
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and (
+        if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=304, headers=headers)
+    return Response(content=build_body(), media_type="application/json", headers=headers)
+
+
+def get_image_process_pool() -> ProcessPoolExecutor:
+    global image_process_pool
+    with executor_lock:
+        if image_process_pool is None:
+            # CPU-bound internal image generation runs in worker processes to stay off the GIL.
+            # Spawn (not fork) because the server process is multi-threaded; workers only
+            # import app.imaging, never this module.
+            image_process_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return image_process_pool
+
+
+def get_pipeline_executor() -> ThreadPoolExecutor:
+    global pipeline_executor
+    with executor_lock:
+        if pipeline_executor is None:
+            # Bounded pool for run_pipeline instead of a fresh thread per uplink/rerun; extra runs wait in QUEUED.
+            pipeline_executor = ThreadPoolExecutor(max_workers=PIPELINE_WORKERS, thread_name_prefix="pipeline")
+        return pipeline_executor
+
+
+def run_in_image_process_pool(generate: Callable[..., None], *args: Any) -> None:
+    global image_process_pool
+    pool = get_image_process_pool()
+    try:
+        pool.submit(generate, *args).result()
+        return
+    except BrokenProcessPool:
+        # A dead worker (e.g. OOM-killed on a large frame) breaks the pool for good; detach it,
+        # unless another pipeline already did, and retry once on a fresh pool.
+        with executor_lock:
+            if image_process_pool is pool:
+                image_process_pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+    get_image_process_pool().submit(generate, *args).result()
+
+
 def run_pipeline(command_id: str) -> None:
-    with store_lock:
+    global commands_version
+    with commands_lock:
         command = commands[command_id]
         sat = satellites.get(command.satellite_id)
         if sat is None:
             command.update_state(CommandState.FAILED, "Satellite not found")
+            commands_version += 1
             return
         if sat.status != SatelliteStatus.AVAILABLE:
             command.update_state(CommandState.FAILED, "Satellite is not available")
+            commands_version += 1
             return
         command.update_state(CommandState.QUEUED, "Queued for next contact window")
+        commands_version += 1
 
     # Simulate waiting for a contact window before uplink ACK.
     time.sleep(random.uniform(0.7, 1.8))
 
-    with store_lock:
+    with commands_lock:
         command.update_state(CommandState.ACKED, "Uplink ACK received from satellite")
+        commands_version += 1
 
     # Simulate command validation/prep on satellite side.
     time.sleep(random.uniform(0.6, 1.6))
 
     if random.random() < (command.fail_probability * 0.6):
-        with store_lock:
+        with commands_lock:
             command.update_state(CommandState.FAILED, "Uplink transmission failed")
+            commands_version += 1
         return
 
-    with store_lock:
+    with commands_lock:
         command.update_state(CommandState.CAPTURING, "Satellite is capturing image")
+        commands_version += 1
 
     # Simulate capture duration.
     time.sleep(random.uniform(1.5, 3.8))
 
     if random.random() < (command.fail_probability * 0.4):
-        with store_lock:
+        with commands_lock:
             command.update_state(CommandState.FAILED, "Capture aborted due to onboard condition")
+            commands_version += 1
         return
 
     output_path = IMAGE_DIR / f"{command.command_id}.png"
@@ -744,38 +1032,52 @@ def run_pipeline(command_id: str) -> None:
         if generation_mode == GenerationMode.EXTERNAL.value:
             generate_external_map_image(command, output_path)
         elif sat.type == SatelliteType.EO_OPTICAL:
-            generate_optical_image(command, output_path)
+            run_in_image_process_pool(
+                generate_optical_image, command.width, command.height, command.cloud_percent, output_path
+            )
         else:
-            generate_sar_image(command, output_path)
+            run_in_image_process_pool(generate_sar_image, command.width, command.height, output_path)
 
-        with store_lock:
+        acquisition, product = build_mock_metadata(sat, command)
+        with commands_lock:
             command.image_path = output_path
-            acquisition, product = build_mock_metadata(sat, command)
             command.acquisition_metadata = acquisition
             command.product_metadata = product
             command.update_state(CommandState.DOWNLINK_READY, "Image downlinked and ready")
+            commands_version += 1
     except Exception as exc:
-        with store_lock:
+        with commands_lock:
             command.update_state(CommandState.FAILED, f"Post-capture pipeline failed: {exc}")
+            commands_version += 1
         return
 
 
+class ImageFileResponse(FileResponse):
+    # Captures are multi-MB PNGs; larger reads mean fewer body messages per download.
+    # Servers that offer the ASGI pathsend extension skip this and send the file themselves.
+    chunk_size = 1024 * 1024
+
+
 def build_command_status(command: Command) -> CommandStatusResponse:
     sat = satellites.get(command.satellite_id)
     if sat is None:
         raise HTTPException(status_code=404, detail="Satellite not found")
 
     station = command.request_profile.get("ground_station") or {}
-    has_file = command.image_path is not None and command.image_path.exists()
+    # image_path is only set once the file is written and is dropped by clear/rerun.
+    has_file = command.image_path is not None
     download_url = f"/downloads/{command.command_id}" if command.state == CommandState.DOWNLINK_READY and has_file else None
 
-    return CommandStatusResponse(
+    station_type = station.get("type")
+
+    # Built from trusted in-memory state without validation; callers dump it straight to JSON.
+    return CommandStatusResponse.model_construct(
         command_id=command.command_id,
         satellite_id=command.satellite_id,
         satellite_type=sat.type,
         ground_station_id=station.get("ground_station_id"),
         ground_station_name=station.get("name"),
-        ground_station_type=station.get("type"),
+        ground_station_type=GroundStationType(station_type) if station_type else None,
         mission_name=command.mission_name,
         aoi_name=command.aoi_name,
         width=command.width,
@@ -794,7 +1096,7 @@ def build_command_status(command: Command) -> CommandStatusResponse:
 
 
 @app.get("/health")
-def health() -> dict[Literal["status"], str]:
+async def health() -> dict[Literal["status"], str]:
     return {"status": "ok"}
 
 
@@ -807,6 +1109,7 @@ def console_index() -> FileResponse:
 
 @app.post("/satellites")
 def create_satellite(req: CreateSatelliteRequest) -> dict[str, str]:
+    global satellites, satellite_json_cache, satellite_json_version
     sat_id = f"sat-{uuid.uuid4().hex[:8]}"
     sat = Satellite(
         satellite_id=sat_id,
@@ -814,37 +1117,57 @@ def create_satellite(req: CreateSatelliteRequest) -> dict[str, str]:
         type=req.type,
         status=req.status,
     )
-    with store_lock:
-        satellites[sat_id] = sat
+    encoded = orjson.dumps(satellite_to_dict(sat))
+    with satellites_lock:
+        satellites = {**satellites, sat_id: sat}
+        satellite_json_cache = {**satellite_json_cache, sat_id: encoded}
+        satellite_json_version += 1
+        index_name_locked(satellite_ids_by_name, sat.name, sat_id)
     return {"satellite_id": sat_id}
 
 
 @app.patch("/satellites/{satellite_id}", response_model=SatelliteResponse)
-def update_satellite(satellite_id: str, req: UpdateSatelliteRequest) -> SatelliteResponse:
-    with store_lock:
+def update_satellite(satellite_id: str, req: UpdateSatelliteRequest) -> Response:
+    global satellite_json_cache, satellite_json_version
+    with satellites_lock:
         sat = satellites.get(satellite_id)
         if sat is None:
             raise HTTPException(status_code=404, detail="Satellite not found")
         if req.name is not None:
+            unindex_name_locked(satellite_ids_by_name, sat.name, satellite_id)
             sat.name = req.name
+            index_name_locked(satellite_ids_by_name, sat.name, satellite_id)
         if req.status is not None:
             sat.status = req.status
-        return SatelliteResponse(**satellite_to_dict(sat))
+        # Already response-shaped; encode once and republish the list cache with the same bytes.
+        body = orjson.dumps(satellite_to_dict(sat))
+        satellite_json_cache = {**satellite_json_cache, satellite_id: body}
+        satellite_json_version += 1
+    return Response(content=body, media_type="application/json")
 
 
 @app.delete("/satellites/{satellite_id}")
 def delete_satellite(satellite_id: str) -> dict[str, str]:
-    with store_lock:
+    global satellites, satellite_json_cache, satellite_json_version
+    with satellites_lock:
         sat = satellites.get(satellite_id)
         if sat is None:
             raise HTTPException(status_code=404, detail="Satellite not found")
         removed_name = sat.name
-        del satellites[satellite_id]
+        updated = dict(satellites)
+        del updated[satellite_id]
+        satellites = updated
+        unindex_name_locked(satellite_ids_by_name, removed_name, satellite_id)
+        updated_json = dict(satellite_json_cache)
+        updated_json.pop(satellite_id, None)
+        satellite_json_cache = updated_json
+        satellite_json_version += 1
     return {"deleted_satellite_id": satellite_id, "deleted_name": removed_name}
 
 
 @app.post("/ground-stations")
 def create_ground_station(req: CreateGroundStationRequest) -> dict[str, str]:
+    global ground_stations, ground_station_json_cache, ground_station_json_version
     station_id = f"gnd-{uuid.uuid4().hex[:8]}"
     station = GroundStation(
         ground_station_id=station_id,
@@ -853,186 +1176,201 @@ def create_ground_station(req: CreateGroundStationRequest) -> dict[str, str]:
         status=req.status,
         location=req.location,
     )
-    with store_lock:
-        ground_stations[station_id] = station
+    encoded = orjson.dumps(ground_station_to_dict(station))
+    with ground_stations_lock:
+        ground_stations = {**ground_stations, station_id: station}
+        ground_station_json_cache = {**ground_station_json_cache, station_id: encoded}
+        ground_station_json_version += 1
+        index_name_locked(ground_station_ids_by_name, station.name, station_id)
     return {"ground_station_id": station_id}
 
 
 @app.patch("/ground-stations/{ground_station_id}", response_model=GroundStationResponse)
-def update_ground_station(ground_station_id: str, req: UpdateGroundStationRequest) -> GroundStationResponse:
-    with store_lock:
+def update_ground_station(ground_station_id: str, req: UpdateGroundStationRequest) -> Response:
+    global ground_station_json_cache, ground_station_json_version
+    with ground_stations_lock:
         station = ground_stations.get(ground_station_id)
         if station is None:
             raise HTTPException(status_code=404, detail="Ground station not found")
         if req.name is not None:
+            unindex_name_locked(ground_station_ids_by_name, station.name, ground_station_id)
             station.name = req.name
+            index_name_locked(ground_station_ids_by_name, station.name, ground_station_id)
         if req.status is not None:
             station.status = req.status
         if req.location is not None:
             station.location = req.location
-        return GroundStationResponse(**ground_station_to_dict(station))
+        body = orjson.dumps(ground_station_to_dict(station))
+        ground_station_json_cache = {**ground_station_json_cache, ground_station_id: body}
+        ground_station_json_version += 1
+    return Response(content=body, media_type="application/json")
 
 
 @app.delete("/ground-stations/{ground_station_id}")
 def delete_ground_station(ground_station_id: str) -> dict[str, str]:
-    with store_lock:
+    global ground_stations, ground_station_json_cache, ground_station_json_version
+    with ground_stations_lock:
         station = ground_stations.get(ground_station_id)
         if station is None:
             raise HTTPException(status_code=404, detail="Ground station not found")
         removed_name = station.name
-        del ground_stations[ground_station_id]
+        updated = dict(ground_stations)
+        del updated[ground_station_id]
+        ground_stations = updated
+        unindex_name_locked(ground_station_ids_by_name, removed_name, ground_station_id)
+        updated_json = dict(ground_station_json_cache)
+        updated_json.pop(ground_station_id, None)
+        ground_station_json_cache = updated_json
+        ground_station_json_version += 1
     return {"deleted_ground_station_id": ground_station_id, "deleted_name": removed_name}
 
 
 @app.post("/seed/mock-ground-stations", response_model=SeedGroundStationsResponse)
 def seed_mock_ground_stations() -> SeedGroundStationsResponse:
-    with store_lock:
+    with ground_stations_lock:
         seeded_ids = seed_default_ground_stations_locked()
     return SeedGroundStationsResponse(ground_station_ids=seeded_ids)
 
 
 @app.get("/ground-stations", response_model=list[GroundStationResponse])
-def list_ground_stations() -> list[GroundStationResponse]:
-    with store_lock:
-        return [GroundStationResponse(**ground_station_to_dict(station)) for station in ground_stations.values()]
+def list_ground_stations(request: Request) -> Response:
+    etag = f'W/"{ETAG_EPOCH}-{ground_station_json_version}"'
+    return etag_json_response(request, etag, lambda: encode_json_list(ground_station_json_cache))
 
 
 @app.post("/seed/mock-satellites", response_model=SeedSatellitesResponse)
 def seed_mock_satellites() -> SeedSatellitesResponse:
-    with store_lock:
+    with satellites_lock:
         seeded_ids = seed_default_satellites_locked()
     return SeedSatellitesResponse(satellite_ids=seeded_ids)
 
 
 @app.get("/satellite-types", response_model=dict[SatelliteType, SatelliteTypeProfileResponse])
-def list_satellite_types() -> dict[SatelliteType, SatelliteTypeProfileResponse]:
-    return {
-        sat_type: SatelliteTypeProfileResponse(
-            platform=profile.platform,
-            orbit_type=profile.orbit_type,
-            nominal_altitude_km=profile.nominal_altitude_km,
-            nominal_swath_km=profile.nominal_swath_km,
-            revisit_hours=profile.revisit_hours,
-            sensor_modes=profile.sensor_modes,
-            default_product_type=profile.default_product_type,
-            default_bands_or_polarization=profile.default_bands_or_polarization,
-        )
-        for sat_type, profile in SATELLITE_TYPE_PROFILES.items()
-    }
+def list_satellite_types(request: Request) -> Response:
+    return etag_json_response(request, SATELLITE_TYPES_ETAG, lambda: SATELLITE_TYPES_JSON)
 
 
 @app.get("/satellites", response_model=list[SatelliteResponse])
-def list_satellites() -> list[SatelliteResponse]:
-    with store_lock:
-        return [SatelliteResponse(**satellite_to_dict(sat)) for sat in satellites.values()]
+def list_satellites(request: Request) -> Response:
+    etag = f'W/"{ETAG_EPOCH}-{satellite_json_version}"'
+    return etag_json_response(request, etag, lambda: encode_json_list(satellite_json_cache))
 
 
 @app.post("/uplink", response_model=UplinkCommandResponse)
 def uplink_command(req: UplinkCommandRequest) -> UplinkCommandResponse:
-    with store_lock:
-        sat = satellites.get(req.satellite_id)
-        if sat is None:
-            raise HTTPException(status_code=404, detail="Satellite not found")
-        station = None
-        if req.ground_station_id is not None:
+    global commands_version
+    sat = satellites.get(req.satellite_id)
+    if sat is None:
+        raise HTTPException(status_code=404, detail="Satellite not found")
+    station = None
+    ground_station_payload = None
+    if req.ground_station_id is not None:
+        with ground_stations_lock:
             station = ground_stations.get(req.ground_station_id)
             if station is None:
                 raise HTTPException(status_code=404, detail="Ground station not found")
             if station.status != GroundStationStatus.OPERATIONAL:
                 raise HTTPException(status_code=409, detail="Ground station is not operational")
-
-        command_id = f"cmd-{uuid.uuid4().hex[:12]}"
-        ground_station_payload = None
-        if station is not None:
             ground_station_payload = {
                 "ground_station_id": station.ground_station_id,
                 "name": station.name,
-                "type": station.type.value,
-                "status": station.status.value,
+                "type": UPLINK_ENUM_VALUES[station.type],
+                "status": UPLINK_ENUM_VALUES[station.status],
                 "location": station.location,
             }
-        request_profile = {
-            "ground_station": ground_station_payload,
-            "aoi_center": (
-                {"lat": req.aoi_center_lat, "lon": req.aoi_center_lon}
-                if req.aoi_center_lat is not None and req.aoi_center_lon is not None
-                else None
-            ),
-            "aoi_bbox": req.aoi_bbox,
-            "window_open_utc": req.window_open_utc,
-            "window_close_utc": req.window_close_utc,
-            "priority": req.priority.value,
-            "eo_constraints": {
-                "max_cloud_cover_percent": req.max_cloud_cover_percent,
-                "max_off_nadir_deg": req.max_off_nadir_deg,
-                "min_sun_elevation_deg": req.min_sun_elevation_deg,
-            },
-            "sar_constraints": {
-                "incidence_min_deg": req.incidence_min_deg,
-                "incidence_max_deg": req.incidence_max_deg,
-                "look_side": req.look_side.value,
-                "pass_direction": req.pass_direction.value,
-                "polarization": req.polarization,
-            },
-            "delivery": {
-                "method": req.delivery_method.value,
-                "path": req.delivery_path,
-            },
-            "generation": {
-                "mode": req.generation_mode.value,
-                "external_map_source": req.external_map_source.value,
-                "external_map_zoom": req.external_map_zoom,
-            },
-        }
-        command = Command(
-            command_id=command_id,
-            satellite_id=req.satellite_id,
-            mission_name=req.mission_name,
-            aoi_name=req.aoi_name,
-            width=req.width,
-            height=req.height,
-            cloud_percent=req.cloud_percent,
-            fail_probability=req.fail_probability,
-            request_profile=request_profile,
-        )
-        commands[command_id] = command
 
-    t = threading.Thread(target=run_pipeline, args=(command_id,), daemon=True)
-    t.start()
+    command_id = f"cmd-{uuid.uuid4().hex[:12]}"
+    request_profile = {
+        "ground_station": ground_station_payload,
+        "aoi_center": (
+            {"lat": req.aoi_center_lat, "lon": req.aoi_center_lon}
+            if req.aoi_center_lat is not None and req.aoi_center_lon is not None
+            else None
+        ),
+        "aoi_bbox": req.aoi_bbox,
+        "window_open_utc": req.window_open_utc,
+        "window_close_utc": req.window_close_utc,
+        "priority": UPLINK_ENUM_VALUES[req.priority],
+        "eo_constraints": {
+            "max_cloud_cover_percent": req.max_cloud_cover_percent,
+            "max_off_nadir_deg": req.max_off_nadir_deg,
+            "min_sun_elevation_deg": req.min_sun_elevation_deg,
+        },
+        "sar_constraints": {
+            "incidence_min_deg": req.incidence_min_deg,
+            "incidence_max_deg": req.incidence_max_deg,
+            "look_side": UPLINK_ENUM_VALUES[req.look_side],
+            "pass_direction": UPLINK_ENUM_VALUES[req.pass_direction],
+            "polarization": req.polarization,
+        },
+        "delivery": {
+            "method": UPLINK_ENUM_VALUES[req.delivery_method],
+            "path": req.delivery_path,
+        },
+        "generation": {
+            "mode": UPLINK_ENUM_VALUES[req.generation_mode],
+            "external_map_source": UPLINK_ENUM_VALUES[req.external_map_source],
+            "external_map_zoom": req.external_map_zoom,
+        },
+    }
+    command = Command(
+        command_id=command_id,
+        satellite_id=req.satellite_id,
+        mission_name=req.mission_name,
+        aoi_name=req.aoi_name,
+        width=req.width,
+        height=req.height,
+        cloud_percent=req.cloud_percent,
+        fail_probability=req.fail_probability,
+        request_profile=request_profile,
+    )
+    # Only the publish step needs the lock; everything above works on request-local data.
+    with commands_lock:
+        commands[command_id] = command
+        commands_version += 1
 
-    return UplinkCommandResponse(
+    response = UplinkCommandResponse.model_construct(
         command_id=command.command_id,
         state=command.state,
         satellite_id=command.satellite_id,
         satellite_type=sat.type,
         ground_station_id=ground_station_payload["ground_station_id"] if ground_station_payload else None,
         ground_station_name=ground_station_payload["name"] if ground_station_payload else None,
-        ground_station_type=ground_station_payload["type"] if ground_station_payload else None,
+        ground_station_type=station.type if station else None,
         mission_name=command.mission_name,
         aoi_name=command.aoi_name,
         created_at=now_iso(command.created_at),
     )
 
+    get_pipeline_executor().submit(run_pipeline, command_id)
+    return response
+
 
 @app.get("/commands", response_model=list[CommandStatusResponse])
-def list_commands() -> list[CommandStatusResponse]:
-    with store_lock:
-        command_list = list(commands.values())
-        return [build_command_status(command) for command in command_list]
+def list_commands(request: Request) -> Response:
+    # Rows carry the satellite type and fail on deleted satellites, so satellite writes count too.
+    etag = f'W/"{ETAG_EPOCH}-{commands_version}.{satellite_json_version}"'
+
+    def build_body() -> bytes:
+        statuses = [build_command_status(command) for command in list(commands.values())]
+        return COMMAND_STATUS_LIST_ADAPTER.dump_json(statuses)
+
+    return etag_json_response(request, etag, build_body)
 
 
 @app.get("/commands/{command_id}", response_model=CommandStatusResponse)
-def get_command(command_id: str) -> CommandStatusResponse:
-    with store_lock:
-        command = commands.get(command_id)
-        if command is None:
-            raise HTTPException(status_code=404, detail="Command not found")
-        return build_command_status(command)
+def get_command(command_id: str) -> Response:
+    command = commands.get(command_id)
+    if command is None:
+        raise HTTPException(status_code=404, detail="Command not found")
+    # Polled by the console for every in-flight command; dump straight to JSON bytes.
+    return Response(content=build_command_status(command).model_dump_json(), media_type="application/json")
 
 
 @app.post("/commands/{command_id}/rerun", response_model=CommandStatusResponse)
 def rerun_command(command_id: str) -> CommandStatusResponse:
-    with store_lock:
+    global commands_version
+    with commands_lock:
         command = commands.get(command_id)
         if command is None:
             raise HTTPException(status_code=404, detail="Command not found")
@@ -1041,86 +1379,106 @@ def rerun_command(command_id: str) -> CommandStatusResponse:
             raise HTTPException(status_code=409, detail="Command is already in progress")
         if command.state != CommandState.FAILED:
             raise HTTPException(status_code=409, detail="Only FAILED commands can be rerun")
+        # Refuse before touching state: a QUEUED command without a pipeline would block reruns for good.
+        if command.satellite_id not in satellites:
+            raise HTTPException(status_code=404, detail="Satellite not found")
 
-        if command.image_path is not None and command.image_path.exists():
-            try:
-                command.image_path.unlink()
-            except OSError:
-                pass
-
+        stale_image_path = command.image_path
         command.image_path = None
         command.acquisition_metadata = None
         command.product_metadata = None
         command.update_state(CommandState.QUEUED, "Re-run requested by operator")
+        commands_version += 1
 
-    t = threading.Thread(target=run_pipeline, args=(command_id,), daemon=True)
-    t.start()
+    # Filesystem work happens outside the lock; the new run rewrites the same path later.
+    if stale_image_path is not None:
+        try:
+            stale_image_path.unlink(missing_ok=True)
+        except OSError:
+            pass
 
-    with store_lock:
-        return build_command_status(commands[command_id])
+    # Build the response before the pipeline starts mutating the command again, but submit
+    # even if building raises so the command never stays QUEUED without a run.
+    try:
+        response = build_command_status(command)
+    finally:
+        get_pipeline_executor().submit(run_pipeline, command_id)
+    return response
 
 
 @app.get("/downloads/{command_id}")
-def download_image(command_id: str) -> FileResponse:
-    with store_lock:
-        command = commands.get(command_id)
-        if command is None:
-            raise HTTPException(status_code=404, detail="Command not found")
-        if command.state != CommandState.DOWNLINK_READY or command.image_path is None:
-            raise HTTPException(status_code=409, detail="Image is not ready")
-        image_path = command.image_path
-    if not image_path.exists():
-        raise HTTPException(status_code=404, detail="Image file not found")
+async def download_image(command_id: str) -> FileResponse:
+    command = commands.get(command_id)
+    if command is None:
+        raise HTTPException(status_code=404, detail="Command not found")
+    image_path = command.image_path
+    if command.state != CommandState.DOWNLINK_READY or image_path is None:
+        raise HTTPException(status_code=409, detail="Image is not ready")
 
-    return FileResponse(
+    try:
+        # One stat per download: it catches a file removed behind our back (clear racing the
+        # pipeline, or a user cleaning data/images) and is passed on so FileResponse skips its own.
+        # Filesystem calls go to the threadpool so this async handler never blocks the event loop.
+        stat_result = await run_in_threadpool(os.stat, image_path)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail="Image file not found") from exc
+
+    return ImageFileResponse(
         image_path,
+        stat_result=stat_result,
         media_type="image/png",
         filename=f"{command_id}.png",
     )
 
 
 @app.post("/downloads/{command_id}/save-local", response_model=SaveLocalDownloadResponse)
-def save_local_download(command_id: str) -> SaveLocalDownloadResponse:
-    with store_lock:
-        command = commands.get(command_id)
-        if command is None:
-            raise HTTPException(status_code=404, detail="Command not found")
-        if command.state != CommandState.DOWNLINK_READY or command.image_path is None:
-            raise HTTPException(status_code=409, detail="Image is not ready")
-        image_path = command.image_path
-
-    resolved = image_path.resolve()
-    if not resolved.exists():
-        raise HTTPException(status_code=404, detail="Image file not found")
+async def save_local_download(command_id: str) -> SaveLocalDownloadResponse:
+    command = commands.get(command_id)
+    if command is None:
+        raise HTTPException(status_code=404, detail="Command not found")
+    image_path = command.image_path
+    if command.state != CommandState.DOWNLINK_READY or image_path is None:
+        raise HTTPException(status_code=409, detail="Image is not ready")
+    try:
+        file_size_bytes = (await run_in_threadpool(os.stat, image_path)).st_size
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail="Image file not found") from exc
 
     return SaveLocalDownloadResponse(
         command_id=command_id,
-        saved_path=str(resolved),
-        file_size_bytes=resolved.stat().st_size,
+        # IMAGE_DIR is derived from Path(__file__).resolve(), so the path is already absolute.
+        saved_path=str(image_path),
+        file_size_bytes=file_size_bytes,
         message="Image is saved in local data/images directory",
     )
 
 
 @app.post("/images/clear", response_model=ClearImagesResponse)
 def clear_images() -> ClearImagesResponse:
+    global commands_version
     deleted_count = 0
     cleared_command_count = 0
 
-    for pattern in ("*.png", "*.jpg", "*.jpeg", "*.webp"):
-        for image_file in IMAGE_DIR.glob(pattern):
+    # One directory listing for every suffix instead of a glob pass per pattern.
+    with os.scandir(IMAGE_DIR) as entries:
+        for entry in entries:
+            if not entry.name.endswith(CLEARABLE_IMAGE_SUFFIXES):
+                continue
             try:
-                image_file.unlink()
+                os.unlink(entry.path)
                 deleted_count += 1
             except FileNotFoundError:
                 continue
 
-    with store_lock:
+    with commands_lock:
         for command in commands.values():
             if command.image_path is not None:
                 command.image_path = None
                 command.message = "Image cleared by operator"
                 command.updated_at = datetime.now(UTC)
                 cleared_command_count += 1
+        if cleared_command_count:
+            commands_version += 1
 
     return ClearImagesResponse(
         deleted_count=deleted_count,
@@ -1137,6 +1495,7 @@ def preview_external_map(
     width: int = Query(default=768, ge=128, le=4096),
     height: int = Query(default=768, ge=128, le=4096),
     source: ExternalMapSource = Query(default=ExternalMapSource.OSM),
+    image_format: PreviewImageFormat = Query(default=PreviewImageFormat.PNG, alias="format"),
 ):
     try:
         image = build_external_map_image(
@@ -1151,6 +1510,12 @@ def preview_external_map(
         raise HTTPException(status_code=502, detail=f"External map preview failed: {exc}") from exc
 
     output = BytesIO()
-    image.save(output, format="PNG")
-    output.seek(0)
-    return StreamingResponse(output, media_type="image/png")
+    if image_format == PreviewImageFormat.WEBP:
+        # method=0 is libwebp's fastest encoder setting; plenty for an interactive preview.
+        image.save(output, format="WEBP", quality=85, method=0)
+        media_type = "image/webp"
+    else:
+        image.save(output, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
+        media_type = "image/png"
+    # One body message: streaming a BytesIO iterates it line by line, one threadpool hop per chunk.
+    return Response(content=output.getvalue(), media_type=media_type)
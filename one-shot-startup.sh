@@ -36,7 +36,7 @@ fi
 
 (
   cd "$ROOT_DIR"
-  nohup "$VENV_UVICORN" app.main:app --host "$HOST" --port "$PORT" >"$LOG_FILE" 2>&1 &
+  nohup "$VENV_UVICORN" app.main:app --host "$HOST" --port "$PORT" --loop uvloop --http httptools >"$LOG_FILE" 2>&1 &
   echo $! > "$PID_FILE"
 )
 